@@ -3,11 +3,12 @@
 import os
 import tempfile
 import unittest
-from unittest.mock import patch, mock_open
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch, mock_open
 
 import yaml
 
-from warp_theme_creator.preview import ThemePreviewGenerator
+from warp_theme_creator.preview import ThemePreviewGenerator, _rasterize_svg, _render_segments
 
 
 class TestThemePreviewGenerator(unittest.TestCase):
@@ -15,6 +16,9 @@ class TestThemePreviewGenerator(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
+        # Start each test with empty render caches so results don't leak between tests
+        _rasterize_svg.cache_clear()
+        _render_segments.cache_clear()
         self.preview_generator = ThemePreviewGenerator()
         self.temp_dir = tempfile.mkdtemp()
         
@@ -58,6 +62,18 @@ class TestThemePreviewGenerator(unittest.TestCase):
                 os.rmdir(os.path.join(root, name))
         os.rmdir(self.temp_dir)
 
+    @staticmethod
+    def _mock_dir_entries(directory, names):
+        """Build mock os.scandir entries for regular files in a directory."""
+        entries = []
+        for name in names:
+            entry = MagicMock()
+            entry.name = name
+            entry.path = os.path.join(directory, name)
+            entry.is_file.return_value = True
+            entries.append(entry)
+        return entries
+
     def test_generate_color_dict(self):
         """Test that color dictionary is correctly generated from theme."""
         color_dict = self.preview_generator.generate_color_dict(self.sample_theme)
@@ -98,6 +114,28 @@ class TestThemePreviewGenerator(unittest.TestCase):
         self.assertIn('circle cx=', svg_content)  # Window control buttons
         self.assertIn('<tspan fill', svg_content)  # Styled text elements
 
+    def test_generate_svg_custom_template(self):
+        """Test that custom templates keep CSS braces and unknown placeholders."""
+        generator = ThemePreviewGenerator(
+            svg_template='<svg><style>.a{fill:red}</style><rect fill="{accent}"/>{e} {accent:x}</svg>'
+        )
+        
+        svg_content = generator.generate_svg(self.sample_theme)
+        
+        self.assertEqual(
+            svg_content,
+            '<svg><style>.a{fill:red}</style><rect fill="#FF0000"/>{e} {accent:x}</svg>'
+        )
+
+    def test_generate_svg_skips_non_string_values(self):
+        """Test that unhashable non-string theme values are left unsubstituted."""
+        generator = ThemePreviewGenerator(svg_template='<svg>{name} {accent}</svg>')
+        theme = dict(self.sample_theme, name=["a", "b"])
+        
+        svg_content = generator.generate_svg(theme)
+        
+        self.assertEqual(svg_content, '<svg>{name} #FF0000</svg>')
+
     @patch("os.makedirs")
     @patch("builtins.open", new_callable=mock_open)
     def test_save_previews(self, mock_file, mock_makedirs):
@@ -109,7 +147,7 @@ class TestThemePreviewGenerator(unittest.TestCase):
         mock_makedirs.assert_called_with("/fake/path/previews", exist_ok=True)
         
         # Check that the SVG file is opened for writing
-        mock_file.assert_called_with("/fake/path/previews/testtheme_preview.svg", "w")
+        mock_file.assert_called_with("/fake/path/previews/testtheme_preview.svg", "wb")
         
         # Check SVG content is written
         file_handle = mock_file()
@@ -120,7 +158,7 @@ class TestThemePreviewGenerator(unittest.TestCase):
         self.assertIsNone(png_path)
 
     @patch("warp_theme_creator.preview.CAIROSVG_AVAILABLE", True)
-    @patch("warp_theme_creator.preview.cairosvg.svg2png", return_value=b"PNG_DATA")
+    @patch("cairosvg.svg2png", return_value=b"PNG_DATA")
     @patch("os.makedirs")
     @patch("builtins.open", new_callable=mock_open)
     def test_save_previews_with_png(self, mock_file, mock_makedirs, mock_svg2png):
@@ -131,7 +169,7 @@ class TestThemePreviewGenerator(unittest.TestCase):
         mock_makedirs.assert_called_with("/fake/path/previews", exist_ok=True)
         
         # Check that both files are opened for writing
-        mock_file.assert_any_call("/fake/path/previews/testtheme_preview.svg", "w")
+        mock_file.assert_any_call("/fake/path/previews/testtheme_preview.svg", "wb")
         mock_file.assert_any_call("/fake/path/previews/testtheme_preview.png", "wb")
         
         # Check that content is written to both files
@@ -145,6 +183,24 @@ class TestThemePreviewGenerator(unittest.TestCase):
         self.assertEqual(svg_path, "/fake/path/previews/testtheme_preview.svg")
         self.assertEqual(png_path, "/fake/path/previews/testtheme_preview.png")
         
+    @patch("warp_theme_creator.preview.CAIROSVG_AVAILABLE", True)
+    @patch("warp_theme_creator.preview.ThemePreviewGenerator.svg_to_png")
+    @patch("os.access", return_value=False)
+    @patch("os.path.exists", return_value=True)
+    @patch("os.makedirs")
+    @patch("builtins.open", new_callable=mock_open)
+    def test_save_previews_skips_unwritable_png(self, mock_file, mock_makedirs, mock_exists,
+                                                mock_access, mock_svg_to_png):
+        """Test that PNG rendering is skipped when the PNG file cannot be written."""
+        svg_path, png_path = self.preview_generator.save_previews(self.sample_theme, "/fake/path", generate_png=True)
+        
+        # Check that no rasterization happened and only the SVG was written
+        self.assertFalse(mock_svg_to_png.called)
+        mock_file.assert_called_once_with("/fake/path/previews/testtheme_preview.svg", "wb")
+        
+        self.assertEqual(svg_path, "/fake/path/previews/testtheme_preview.svg")
+        self.assertIsNone(png_path)
+        
     @patch("os.makedirs")
     @patch("builtins.open", new_callable=mock_open)
     def test_save_preview_backward_compatibility(self, mock_file, mock_makedirs):
@@ -155,7 +211,7 @@ class TestThemePreviewGenerator(unittest.TestCase):
         mock_makedirs.assert_called_with("/fake/path/previews", exist_ok=True)
         
         # Check that the file is opened for writing
-        mock_file.assert_called_with("/fake/path/previews/testtheme_preview.svg", "w")
+        mock_file.assert_called_with("/fake/path/previews/testtheme_preview.svg", "wb")
         
         # Check content is written
         file_handle = mock_file()
@@ -164,8 +220,7 @@ class TestThemePreviewGenerator(unittest.TestCase):
         # Check that the returned path is correct
         self.assertEqual(output_path, "/fake/path/previews/testtheme_preview.svg")
 
-    @patch("os.path.isfile", return_value=True)
-    @patch("os.listdir", return_value=["theme1.yaml", "theme2.yml", "not_a_theme.txt"])
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open, read_data=yaml.dump({
         "name": "Theme1",
         "accent": "#FF0000",
@@ -179,8 +234,12 @@ class TestThemePreviewGenerator(unittest.TestCase):
         }
     }))
     @patch("warp_theme_creator.preview.ThemePreviewGenerator.save_previews")
-    def test_generate_previews_for_directory(self, mock_save_previews, mock_open_file, mock_listdir, mock_isfile):
+    def test_generate_previews_for_directory(self, mock_save_previews, mock_open_file, mock_scandir):
         """Test generating previews for all themes in a directory."""
+        mock_scandir.return_value.__enter__.return_value = self._mock_dir_entries(
+            "/fake/path", ["theme1.yaml", "theme2.yml", "not_a_theme.txt"]
+        )
+        
         # Set up mock to return different paths for different themes
         mock_save_previews.side_effect = [
             ("/fake/path/previews/theme1_preview.svg", None),
@@ -188,7 +247,9 @@ class TestThemePreviewGenerator(unittest.TestCase):
         ]
         
         # Generate previews (SVG only)
-        preview_paths = self.preview_generator.generate_previews_for_directory("/fake/path", generate_png=False)
+        preview_paths = self.preview_generator.generate_previews_for_directory(
+            "/fake/path", generate_png=False, max_workers=1
+        )
         
         # Check that save_previews was called twice (once for each theme)
         self.assertEqual(mock_save_previews.call_count, 2)
@@ -201,8 +262,7 @@ class TestThemePreviewGenerator(unittest.TestCase):
         self.assertIsNone(preview_paths[1][1])  # No PNG path
         
     @patch("warp_theme_creator.preview.CAIROSVG_AVAILABLE", True)
-    @patch("os.path.isfile", return_value=True)
-    @patch("os.listdir", return_value=["theme1.yaml", "theme2.yml", "not_a_theme.txt"])
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open, read_data=yaml.dump({
         "name": "Theme1",
         "accent": "#FF0000",
@@ -216,8 +276,12 @@ class TestThemePreviewGenerator(unittest.TestCase):
         }
     }))
     @patch("warp_theme_creator.preview.ThemePreviewGenerator.save_previews")
-    def test_generate_previews_for_directory_with_png(self, mock_save_previews, mock_open_file, mock_listdir, mock_isfile):
+    def test_generate_previews_for_directory_with_png(self, mock_save_previews, mock_open_file, mock_scandir):
         """Test generating both SVG and PNG previews for all themes in a directory."""
+        mock_scandir.return_value.__enter__.return_value = self._mock_dir_entries(
+            "/fake/path", ["theme1.yaml", "theme2.yml", "not_a_theme.txt"]
+        )
+        
         # Set up mock to return different paths for different themes
         mock_save_previews.side_effect = [
             ("/fake/path/previews/theme1_preview.svg", "/fake/path/previews/theme1_preview.png"),
@@ -225,7 +289,9 @@ class TestThemePreviewGenerator(unittest.TestCase):
         ]
         
         # Generate previews (SVG and PNG)
-        preview_paths = self.preview_generator.generate_previews_for_directory("/fake/path", generate_png=True)
+        preview_paths = self.preview_generator.generate_previews_for_directory(
+            "/fake/path", generate_png=True, max_workers=1
+        )
         
         # Check that save_previews was called twice (once for each theme)
         self.assertEqual(mock_save_previews.call_count, 2)
@@ -237,6 +303,67 @@ class TestThemePreviewGenerator(unittest.TestCase):
         self.assertEqual(preview_paths[1][0], "/fake/path/previews/theme2_preview.svg")
         self.assertEqual(preview_paths[1][1], "/fake/path/previews/theme2_preview.png")
 
+    def test_generate_previews_for_directory_in_process_pool(self):
+        """Test generating previews for several themes across worker processes."""
+        for name in ["Alpha", "Beta", "Gamma"]:
+            theme = dict(self.sample_theme, name=name)
+            with open(os.path.join(self.temp_dir, f"{name.lower()}.yaml"), "w") as f:
+                yaml.dump(theme, f)
+        
+        preview_paths = self.preview_generator.generate_previews_for_directory(
+            self.temp_dir, generate_png=False, max_workers=2
+        )
+        
+        # Check that every theme produced an SVG preview on disk
+        svg_paths = sorted(svg_path for svg_path, _ in preview_paths)
+        expected = sorted(
+            os.path.join(self.temp_dir, "previews", f"{name}_preview.svg")
+            for name in ["alpha", "beta", "gamma"]
+        )
+        self.assertEqual(svg_paths, expected)
+        for svg_path in svg_paths:
+            self.assertTrue(os.path.isfile(svg_path))
+
+    @patch("warp_theme_creator.preview.ProcessPoolExecutor", wraps=ThreadPoolExecutor)
+    def test_generate_previews_for_directory_caps_pool_size(self, mock_executor):
+        """Test that the worker pool is no larger than the number of themes."""
+        for name in ["Alpha", "Beta"]:
+            theme = dict(self.sample_theme, name=name)
+            with open(os.path.join(self.temp_dir, f"{name.lower()}.yaml"), "w") as f:
+                yaml.dump(theme, f)
+        
+        preview_paths = self.preview_generator.generate_previews_for_directory(
+            self.temp_dir, generate_png=False, max_workers=8
+        )
+        
+        mock_executor.assert_called_once_with(max_workers=2)
+        self.assertEqual(len(preview_paths), 2)
+
+    @patch("warp_theme_creator.preview.ThemePreviewGenerator.save_previews")
+    def test_generate_previews_for_directory_skips_up_to_date(self, mock_save_previews):
+        """Test that previews newer than their theme file are not regenerated."""
+        # Theme files are named like ThemeGenerator.save_theme names them,
+        # which differs from the preview name for multi-word themes
+        theme_path = os.path.join(self.temp_dir, "test_theme.yaml")
+        with open(theme_path, "w") as f:
+            yaml.dump(self.sample_theme, f)
+        
+        previews_dir = os.path.join(self.temp_dir, "previews")
+        os.makedirs(previews_dir)
+        svg_path = os.path.join(previews_dir, "testtheme_preview.svg")
+        with open(svg_path, "w") as f:
+            f.write("<svg/>")
+        
+        # Make the theme file older than its preview
+        os.utime(theme_path, (0, 0))
+        
+        preview_paths = self.preview_generator.generate_previews_for_directory(
+            self.temp_dir, generate_png=False, max_workers=1
+        )
+        
+        self.assertFalse(mock_save_previews.called)
+        self.assertEqual(preview_paths, [(svg_path, None)])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,8 +1,10 @@
 """Tests for the screenshots module."""
 
+import base64
 import os
 import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock
 import io
 from PIL import Image
@@ -32,6 +34,13 @@ class TestScreenshotExtractor(unittest.TestCase):
         self.assertEqual(self.extractor.rgb_to_hex((0, 0, 255)), "#0000FF")
         self.assertEqual(self.extractor.rgb_to_hex((51, 51, 51)), "#333333")
         
+    def test_hex_to_rgb(self):
+        """Test hex to RGB conversion."""
+        self.assertEqual(self.extractor.hex_to_rgb("#FF0000"), (255, 0, 0))
+        self.assertEqual(self.extractor.hex_to_rgb("#00ff00"), (0, 255, 0))
+        self.assertEqual(self.extractor.hex_to_rgb("0000FF"), (0, 0, 255))
+        self.assertEqual(self.extractor.hex_to_rgb("#333333"), (51, 51, 51))
+        
     def test_get_color_brightness(self):
         """Test color brightness calculation."""
         # Dark colors
@@ -77,11 +86,12 @@ class TestScreenshotExtractor(unittest.TestCase):
         # Create a small red test image
         test_img = Image.new('RGB', (100, 100), color=(255, 0, 0))
         img_bytes = io.BytesIO()
-        test_img.save(img_bytes, format='PNG')
-        img_bytes.seek(0)
+        test_img.save(img_bytes, format='JPEG')
         
-        # Mock driver screenshot return value
-        mock_driver.get_screenshot_as_png.return_value = img_bytes.getvalue()
+        # Mock the CDP screenshot command return value
+        mock_driver.execute_cdp_cmd.return_value = {
+            'data': base64.b64encode(img_bytes.getvalue()).decode('ascii')
+        }
         
         # Test the function
         result_img = self.extractor.take_screenshot("https://example.com", save=False)
@@ -89,6 +99,34 @@ class TestScreenshotExtractor(unittest.TestCase):
         # Verify the result
         self.assertIsInstance(result_img, Image.Image)
         mock_driver.get.assert_called_once_with("https://example.com")
+        mock_driver.execute_async_script.assert_called_once()
+        
+        # The driver stays open for reuse until the extractor is closed
+        mock_driver.quit.assert_not_called()
+        self.extractor.close()
+        mock_driver.quit.assert_called_once()
+        
+    @patch('warp_theme_creator.screenshots.ScreenshotExtractor.setup_driver')
+    def test_take_screenshots_reuses_driver(self, mock_setup_driver):
+        """Test that a batch of screenshots shares one webdriver session."""
+        mock_driver = MagicMock()
+        mock_setup_driver.return_value = mock_driver
+        
+        test_img = Image.new('RGB', (10, 10), color=(0, 0, 255))
+        img_bytes = io.BytesIO()
+        test_img.save(img_bytes, format='JPEG')
+        mock_driver.execute_cdp_cmd.return_value = {
+            'data': base64.b64encode(img_bytes.getvalue()).decode('ascii')
+        }
+        
+        urls = ["https://example.com", "https://example.org"]
+        with self.extractor as extractor:
+            images = extractor.take_screenshots(urls, save=False)
+        
+        # Verify one driver served every URL and was quit on exit
+        self.assertEqual(len(images), 2)
+        mock_setup_driver.assert_called_once()
+        self.assertEqual(mock_driver.get.call_count, 2)
         mock_driver.quit.assert_called_once()
         
     def test_extract_colors_from_image(self):
@@ -121,6 +159,14 @@ class TestScreenshotExtractor(unittest.TestCase):
         for _, percentage in colors:
             self.assertAlmostEqual(percentage, 0.5, delta=0.1)
             
+    def test_extract_colors_from_uniform_image(self):
+        """Test that a single-color image yields that color at 100%."""
+        img = Image.new('RGB', (400, 300), color=(30, 60, 90))
+        
+        colors = self.extractor.extract_colors_from_image(img, n_colors=4)
+        
+        self.assertEqual(colors, [("#1E3C5A", 1.0)])
+            
     def test_is_background_color(self):
         """Test background color detection."""
         # Create a test image with blue edge and red center
@@ -142,13 +188,20 @@ class TestScreenshotExtractor(unittest.TestCase):
         # Red should not be detected as background
         self.assertFalse(self.extractor.is_background_color("#FF0000", img))
         
-    @patch('warp_theme_creator.screenshots.ScreenshotExtractor.take_screenshot')
+        # A pre-converted RGB array should give the same results
+        pixels = np.asarray(img)
+        self.assertTrue(self.extractor.is_background_color("#0000FF", pixels))
+        self.assertFalse(self.extractor.is_background_color("#FF0000", pixels))
+        
+    @patch('warp_theme_creator.screenshots.ScreenshotExtractor.capture_screenshot')
     @patch('warp_theme_creator.screenshots.ScreenshotExtractor.extract_colors_from_image')
-    def test_extract_theme_colors(self, mock_extract_colors, mock_take_screenshot):
+    def test_extract_theme_colors(self, mock_extract_colors, mock_capture_screenshot):
         """Test theme color extraction end-to-end."""
         # Create a test image
         test_img = Image.new('RGB', (100, 100), color=(255, 255, 255))  # White image
-        mock_take_screenshot.return_value = test_img
+        img_bytes = io.BytesIO()
+        test_img.save(img_bytes, format='JPEG')
+        mock_capture_screenshot.return_value = img_bytes.getvalue()
         
         # Mock extracted colors
         mock_dominant_colors = [
@@ -190,6 +243,40 @@ class TestScreenshotExtractor(unittest.TestCase):
         self.assertEqual(theme_colors['background'], "#333333")
         # Foreground should be light on dark background
         self.assertEqual(theme_colors['foreground'], "#FFFFFF")
+        
+    @patch('warp_theme_creator.screenshots.ScreenshotExtractor.extract_theme_colors')
+    def test_extract_theme_colors_batch(self, mock_extract_theme_colors):
+        """Test batch extraction returns colors keyed by URL in input order."""
+        mock_extract_theme_colors.side_effect = lambda url, *args: {'background': url}
+        
+        urls = ["https://example.com", "https://example.org"]
+        theme_colors = self.extractor.extract_theme_colors_batch(urls, max_workers=1)
+        
+        # Each URL maps to its own result, in the order given
+        self.assertEqual(list(theme_colors), urls)
+        self.assertEqual(theme_colors["https://example.org"], {'background': "https://example.org"})
+        self.assertEqual(mock_extract_theme_colors.call_count, 2)
+        
+    @patch('warp_theme_creator.screenshots.ProcessPoolExecutor', ThreadPoolExecutor)
+    @patch('warp_theme_creator.screenshots.ScreenshotExtractor._driver_path', None)
+    @patch('warp_theme_creator.screenshots.ScreenshotExtractor.resolve_driver_path')
+    @patch('warp_theme_creator.screenshots.ScreenshotExtractor.extract_theme_colors')
+    def test_extract_theme_colors_batch_in_worker_pool(self, mock_extract_theme_colors,
+                                                      mock_resolve_driver_path):
+        """Test that the pooled path chunks URLs and reassembles results in input order."""
+        # Threads stand in for processes so the patched extraction is shared
+        mock_extract_theme_colors.side_effect = lambda url, *args: {'background': url}
+        
+        urls = [f"https://example{i}.com" for i in range(5)]
+        theme_colors = self.extractor.extract_theme_colors_batch(urls, max_workers=2)
+        
+        # Results come back keyed by URL, in the order given, despite interleaved chunks
+        self.assertEqual(list(theme_colors), urls)
+        for url in urls:
+            self.assertEqual(theme_colors[url], {'background': url})
+        self.assertEqual(mock_extract_theme_colors.call_count, 5)
+        # The driver is resolved once up front, not per worker
+        mock_resolve_driver_path.assert_called_once()
 
 
 if __name__ == '__main__':
@@ -55,6 +55,27 @@ class TestThemeGenerator(unittest.TestCase):
         self.assertEqual(theme["terminal_colors"]["bright"]["black"], "#555555")
         self.assertEqual(theme["terminal_colors"]["bright"]["red"], "#FF5555")
 
+    def test_create_theme_does_not_modify_template(self):
+        """Test that creating a theme leaves the template colors untouched."""
+        self.generator.create_theme(
+            accent="#0087D7",
+            background="#1E1E1E",
+            foreground="#FFFFFF",
+            terminal_colors=self.test_terminal_colors,
+            name="Test Theme"
+        )
+        
+        # A later theme without overrides should get the template defaults
+        theme = self.generator.create_theme(
+            accent="#0087D7",
+            background="#1E1E1E",
+            foreground="#FFFFFF",
+            terminal_colors={}
+        )
+        self.assertEqual(theme["terminal_colors"]["normal"]["red"], "#FF5555")
+        self.assertEqual(theme["terminal_colors"]["bright"]["black"], "#4D4D4D")
+        self.assertEqual(self.generator.template["terminal_colors"]["normal"]["red"], "#FF5555")
+
     def test_create_theme_with_background_image(self):
         """Test theme creation with background image."""
         theme = self.generator.create_theme(
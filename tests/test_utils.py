@@ -6,7 +6,8 @@ from warp_theme_creator.utils import (
     adjust_color_brightness,
     adjust_color_saturation,
     rgb_to_hsl,
-    hsl_to_rgb
+    hsl_to_rgb,
+    sanitize_theme_name
 )
 
 
@@ -43,6 +44,22 @@ class TestUtils(unittest.TestCase):
             with self.subTest(color=color):
                 self.assertFalse(is_valid_hex_color(color))
 
+    def test_sanitize_theme_name(self):
+        """Test theme name sanitization for filenames."""
+        test_cases = [
+            ("Test Theme", "testtheme"),
+            ("my_theme-2.0", "my_theme20"),
+            ("Example!", "example"),
+            ("Café", "café"),  # Non-ASCII letters are kept
+            ("GitHub — Home", "githubhome"),  # Non-ASCII punctuation is removed
+            ("Brand™\u00a0Theme", "brandtheme"),  # As are symbols and non-breaking spaces
+            ("", ""),
+        ]
+        
+        for name, expected in test_cases:
+            with self.subTest(name=name):
+                self.assertEqual(sanitize_theme_name(name), expected)
+
     def test_adjust_color_brightness(self):
         """Test brightness adjustment."""
         # Test brightening
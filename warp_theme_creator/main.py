@@ -4,6 +4,7 @@ This module provides the command-line interface for the tool.
 """
 
 import argparse
+import logging
 import os
 import sys
 import shutil
@@ -17,7 +18,7 @@ from warp_theme_creator.fetcher import Fetcher
 from warp_theme_creator.color_extractor import ColorExtractor
 from warp_theme_creator.theme_generator import ThemeGenerator
 from warp_theme_creator.preview import ThemePreviewGenerator
-from warp_theme_creator.utils import adjust_color_brightness, adjust_color_saturation
+from warp_theme_creator.utils import adjust_color_brightness, adjust_color_saturation, sanitize_theme_name
 from warp_theme_creator.screenshots import ScreenshotExtractor
 
 
@@ -192,17 +193,17 @@ def fetch_website_resources(fetcher: Fetcher, url: str, max_css: int, max_images
     return resources
 
 
-def validate_image(img_file: BytesIO) -> Optional[Tuple[int, int, float]]:
+def validate_image(image_bytes: bytes) -> Optional[Tuple[int, int, float]]:
     """Validate an image and extract its dimensions and aspect ratio.
     
     Args:
-        img_file: BytesIO object containing image data
+        image_bytes: Binary image data
         
     Returns:
         Tuple of (width, height, aspect_ratio) or None if invalid
     """
     try:
-        with Image.open(img_file) as img:
+        with Image.open(BytesIO(image_bytes)) as img:
             if not img.format:
                 return None
             
@@ -229,29 +230,23 @@ def filter_suitable_background_images(resources: Dict) -> List[Dict]:
     image_data = []
     
     for image_url, image_bytes in resources.get('image_contents', {}).items():
-        try:
-            with BytesIO(image_bytes) as img_file:
-                dimensions = validate_image(img_file)
-                if not dimensions:
-                    continue
-                    
-                width, height, aspect_ratio = dimensions
-                
-                img_file.seek(0)
-                
-                size = width * height
-                if size < 10000 or aspect_ratio > 5 or aspect_ratio < 0.2:
-                    continue
-                
-                image_data.append({
-                    'url': image_url,
-                    'bytes': image_bytes,
-                    'size': size,
-                    'width': width,
-                    'height': height
-                })
-        except Exception:
+        dimensions = validate_image(image_bytes)
+        if not dimensions:
+            continue
+            
+        width, height, aspect_ratio = dimensions
+        
+        size = width * height
+        if size < 10000 or aspect_ratio > 5 or aspect_ratio < 0.2:
             continue
+        
+        image_data.append({
+            'url': image_url,
+            'bytes': image_bytes,
+            'size': size,
+            'width': width,
+            'height': height
+        })
     
     image_data.sort(key=lambda x: x['size'], reverse=True)
     return image_data
@@ -294,7 +289,7 @@ def save_background_image(image_data: Dict, theme_name: str, output_dir: str) ->
     images_dir = os.path.join(output_dir, "images")
     os.makedirs(images_dir, exist_ok=True)
     
-    sanitized_name = ''.join(c for c in theme_name.lower() if c.isalnum() or c == '_')
+    sanitized_name = sanitize_theme_name(theme_name)
     filename = f"{sanitized_name}_background.jpg"
     output_path = os.path.join(images_dir, filename)
     
@@ -729,13 +724,12 @@ def extract_colors_using_screenshot(
     print("Using screenshot-based color extraction...")
     
     screenshots_dir = os.path.join(output_dir, "screenshots") if save_screenshot else None
-    screenshot_extractor = ScreenshotExtractor(screenshots_dir=screenshots_dir)
-    
-    return screenshot_extractor.extract_theme_colors(
-        url,
-        prefer_light=prefer_light,
-        save_screenshot=save_screenshot
-    )
+    with ScreenshotExtractor(screenshots_dir=screenshots_dir) as screenshot_extractor:
+        return screenshot_extractor.extract_theme_colors(
+            url,
+            prefer_light=prefer_light,
+            save_screenshot=save_screenshot
+        )
 
 
 def generate_previews(
@@ -814,6 +808,22 @@ def print_theme_details(
             print(f"View PNG preview: {png_path}")
 
 
+def configure_logging() -> None:
+    """Send the package's progress messages to stdout alongside its other output.
+
+    Only the warp_theme_creator logger is configured, so INFO messages from
+    third-party libraries such as selenium stay hidden.
+    """
+    package_logger = logging.getLogger("warp_theme_creator")
+    if package_logger.handlers:
+        return
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    package_logger.addHandler(handler)
+    package_logger.setLevel(logging.INFO)
+
+
 def main(args: Optional[List[str]] = None) -> int:
     """Main entry point for the application.
 
@@ -827,6 +837,7 @@ def main(args: Optional[List[str]] = None) -> int:
         args = sys.argv[1:]
     
     parsed_args = parse_args(args)
+    configure_logging()
     
     fetcher = Fetcher()
     color_extractor = ColorExtractor()
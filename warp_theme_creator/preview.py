@@ -3,16 +3,27 @@
 This module generates SVG and PNG preview images for Warp terminal themes.
 """
 
+import importlib.util
 import os
+import re
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional, Tuple, Union
-import yaml
 import io
 
-try:
-    import cairosvg
-    CAIROSVG_AVAILABLE = True
-except ImportError:
-    CAIROSVG_AVAILABLE = False
+from warp_theme_creator.utils import sanitize_theme_name
+
+CAIROSVG_AVAILABLE = importlib.util.find_spec("cairosvg") is not None
+
+
+_DEFAULT_COLORS = MappingProxyType({
+    "black": "#000000", "red": "#FF0000", "green": "#00FF00", "yellow": "#FFFF00",
+    "blue": "#0000FF", "magenta": "#FF00FF", "cyan": "#00FFFF", "white": "#FFFFFF",
+    "brblack": "#808080", "brred": "#FF8080", "brgreen": "#80FF80", "bryellow": "#FFFF80",
+    "brblue": "#8080FF", "brmagenta": "#FF80FF", "brcyan": "#80FFFF", "brwhite": "#FFFFFF"
+})
 
 
 DEFAULT_SVG_TEMPLATE = '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 1000 600">
@@ -223,6 +234,113 @@ DEFAULT_SVG_TEMPLATE = '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 1
 </svg>'''
 
 
+def _minify_svg(svg: str) -> str:
+    """Strip comments and indentation from SVG markup.
+    
+    Only whitespace runs that span a line break next to a tag are removed,
+    which SVG text layout discards anyway, so rendering is unchanged.
+    
+    Args:
+        svg: SVG markup
+        
+    Returns:
+        Minified SVG markup
+    """
+    svg = re.sub(r'<!--.*?-->', '', svg, flags=re.S)
+    svg = re.sub(r'>[ \t]*\n\s*', '>', svg)
+    svg = re.sub(r'\s*\n[ \t]*<', '<', svg)
+    return svg.strip()
+
+
+DEFAULT_SVG_TEMPLATE = _minify_svg(DEFAULT_SVG_TEMPLATE)
+
+
+def _compile_template(template: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Split an SVG template into literal text and placeholder segments.
+    
+    Only bare {word} placeholders are treated as fields; any other braces,
+    such as CSS rules in a <style> block, are kept as literal text.
+    
+    Args:
+        template: SVG template using {name} style placeholders
+        
+    Returns:
+        Tuple of (literal_text, placeholder_name or None) pairs
+    """
+    parts = re.split(r'\{(\w+)\}', template)
+    return tuple(zip(parts[0::2], parts[1::2] + [None]))
+
+
+DEFAULT_SVG_SEGMENTS = _compile_template(DEFAULT_SVG_TEMPLATE)
+
+
+def _parse_viewbox_size(svg: str) -> Optional[Tuple[float, float]]:
+    """Read the native width and height from an SVG viewBox.
+    
+    Args:
+        svg: SVG markup
+        
+    Returns:
+        Tuple of (width, height) or None if there is no viewBox at the origin
+    """
+    match = re.search(r'viewBox="0 0 ([\d.]+) ([\d.]+)"', svg)
+    if not match:
+        return None
+    return float(match.group(1)), float(match.group(2))
+
+
+class _TemplateColors(dict):
+    """Color mapping that leaves unknown template placeholders untouched."""
+
+    def __missing__(self, key: str) -> str:
+        return f"{{{key}}}"
+
+
+@lru_cache(maxsize=256)
+def _render_segments(segments: Tuple[Tuple[str, Optional[str]], ...],
+                     color_items: Tuple[Tuple[str, str], ...]) -> str:
+    """Render compiled template segments with the given colors.
+    
+    Args:
+        segments: Compiled template segments from _compile_template
+        color_items: Sorted (placeholder_name, value) pairs
+        
+    Returns:
+        Rendered SVG content as a string
+    """
+    colors = _TemplateColors(color_items)
+    parts = []
+    
+    for literal, key in segments:
+        parts.append(literal)
+        if key is not None:
+            parts.append(str(colors[key]))
+    
+    return "".join(parts)
+
+
+@lru_cache(maxsize=32)
+def _rasterize_svg(svg_bytes: bytes, width: Optional[int], height: Optional[int]) -> bytes:
+    """Rasterize SVG content to PNG, reusing results for identical previews.
+    
+    Args:
+        svg_bytes: UTF-8 encoded SVG content
+        width: Width of the output PNG, or None for the SVG's own size
+        height: Height of the output PNG, or None for the SVG's own size
+        
+    Returns:
+        PNG image data as bytes
+    """
+    import cairosvg
+    
+    return cairosvg.svg2png(
+        bytestring=svg_bytes,
+        write_to=None,
+        output_width=width,
+        output_height=height
+    )
+
+
 class ThemePreviewGenerator:
     """Generate SVG and PNG previews for Warp terminal themes."""
 
@@ -233,6 +351,9 @@ class ThemePreviewGenerator:
             svg_template: Optional custom SVG template
         """
         self.svg_template = svg_template or DEFAULT_SVG_TEMPLATE
+        self._segments = (_compile_template(svg_template) if svg_template
+                          else DEFAULT_SVG_SEGMENTS)
+        self._native_size = _parse_viewbox_size(self.svg_template)
     
     def generate_color_dict(self, theme: Dict[str, Any]) -> Dict[str, str]:
         """Convert theme data to a color dictionary for SVG template.
@@ -243,7 +364,7 @@ class ThemePreviewGenerator:
         Returns:
             Dictionary of all colors in a format ready for SVG template
         """
-        color_dict = {}
+        color_dict = dict(_DEFAULT_COLORS)
         
         color_dict["name"] = theme.get("name", "Generated Theme")
         
@@ -251,24 +372,10 @@ class ThemePreviewGenerator:
         color_dict["foreground"] = theme.get("foreground", "#FFFFFF")
         color_dict["background"] = theme.get("background", "#1E1E1E")
         
-        normal_colors = theme.get("terminal_colors", {}).get("normal", {})
-        for color_name, color_value in normal_colors.items():
-            color_dict[color_name] = color_value
+        color_dict.update(theme.get("terminal_colors", {}).get("normal", {}))
         
         bright_colors = theme.get("terminal_colors", {}).get("bright", {})
-        for color_name, color_value in bright_colors.items():
-            color_dict[f"br{color_name}"] = color_value
-        
-        default_colors = {
-            "black": "#000000", "red": "#FF0000", "green": "#00FF00", "yellow": "#FFFF00",
-            "blue": "#0000FF", "magenta": "#FF00FF", "cyan": "#00FFFF", "white": "#FFFFFF",
-            "brblack": "#808080", "brred": "#FF8080", "brgreen": "#80FF80", "bryellow": "#FFFF80",
-            "brblue": "#8080FF", "brmagenta": "#FF80FF", "brcyan": "#80FFFF", "brwhite": "#FFFFFF"
-        }
-        
-        for color_name, default_value in default_colors.items():
-            if color_name not in color_dict:
-                color_dict[color_name] = default_value
+        color_dict.update(("br" + color_name, color_value) for color_name, color_value in bright_colors.items())
         
         return color_dict
     
@@ -282,19 +389,16 @@ class ThemePreviewGenerator:
             SVG content as a string
         """
         color_dict = self.generate_color_dict(theme)
-        svg_content = self.svg_template
-        
-        for key, value in color_dict.items():
-            if isinstance(value, str):
-                svg_content = svg_content.replace(f"{{{key}}}", value)
-        
-        return svg_content
+        # Only string values are substituted, which also keeps the cache key hashable
+        color_items = tuple(sorted((key, value) for key, value in color_dict.items()
+                                   if isinstance(value, str)))
+        return _render_segments(self._segments, color_items)
     
-    def svg_to_png(self, svg_content: str, width: int = 1000, height: int = 600) -> bytes:
+    def svg_to_png(self, svg_content: Union[str, bytes], width: int = 1000, height: int = 600) -> bytes:
         """Convert SVG content to PNG image data.
         
         Args:
-            svg_content: SVG content string
+            svg_content: SVG content string or UTF-8 encoded bytes
             width: Width of the output PNG
             height: Height of the output PNG
             
@@ -308,14 +412,13 @@ class ThemePreviewGenerator:
             raise ImportError("The cairosvg library is required for PNG conversion. "
                              "Install it with: pip install cairosvg")
         
-        png_data = cairosvg.svg2png(
-            bytestring=svg_content.encode('utf-8'),
-            write_to=None,
-            output_width=width,
-            output_height=height
-        )
+        if isinstance(svg_content, str):
+            svg_content = svg_content.encode('utf-8')
+        
+        if (width, height) == self._native_size:
+            return _rasterize_svg(svg_content, None, None)
         
-        return png_data
+        return _rasterize_svg(svg_content, width, height)
     
     def save_previews(self, theme: Dict[str, Any], output_path: str, 
                      generate_png: bool = True) -> Tuple[str, Optional[str]]:
@@ -330,64 +433,109 @@ class ThemePreviewGenerator:
             Tuple of (svg_path, png_path or None)
         """
         theme_name = theme.get("name", "generated_theme")
-        sanitized_name = ''.join(c for c in theme_name.lower() if c.isalnum() or c == '_')
-        svg_filename = f"{sanitized_name}_preview.svg"
-        png_filename = f"{sanitized_name}_preview.png"
+        svg_path, png_path = _preview_paths(theme, output_path, generate_png)
         
-        previews_dir = os.path.join(output_path, "previews")
-        os.makedirs(previews_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(svg_path), exist_ok=True)
         
-        svg_path = os.path.join(previews_dir, svg_filename)
-        png_path = os.path.join(previews_dir, png_filename) if generate_png else None
+        svg_bytes = self.generate_svg(theme).encode('utf-8')
         
-        svg_content = self.generate_svg(theme)
+        with open(svg_path, 'wb') as f:
+            f.write(svg_bytes)
         
-        with open(svg_path, 'w') as f:
-            f.write(svg_content)
-        
-        if generate_png and CAIROSVG_AVAILABLE:
-            try:
-                png_data = self.svg_to_png(svg_content)
-                with open(png_path, 'wb') as f:
-                    f.write(png_data)
-            except Exception as e:
-                print(f"Error generating PNG preview for {theme_name}: {str(e)}")
+        if png_path is not None:
+            if os.path.exists(png_path) and not os.access(png_path, os.W_OK):
+                print(f"Warning: Cannot generate PNG preview for {theme_name} - {png_path} is not writable")
+                png_path = None
+            elif CAIROSVG_AVAILABLE:
+                try:
+                    png_data = self.svg_to_png(svg_bytes)
+                    with open(png_path, 'wb') as f:
+                        f.write(png_data)
+                except Exception as e:
+                    print(f"Error generating PNG preview for {theme_name}: {str(e)}")
+                    png_path = None
+            else:
+                print(f"Warning: Cannot generate PNG preview for {theme_name} - cairosvg is not available")
                 png_path = None
-        elif generate_png and not CAIROSVG_AVAILABLE:
-            print(f"Warning: Cannot generate PNG preview for {theme_name} - cairosvg is not available")
-            png_path = None
         
         return svg_path, png_path
     
     def generate_previews_for_directory(self, themes_dir: str, 
-                                       generate_png: bool = True) -> List[Tuple[str, Optional[str]]]:
+                                       generate_png: bool = True,
+                                       max_workers: Optional[int] = None) -> List[Tuple[str, Optional[str]]]:
         """Generate previews for all themes in a directory.
         
+        Themes whose previews are newer than the theme file are skipped.
+        The rest are rendered in a process pool unless max_workers is 1 or
+        there is only a single theme file, in which case loading and
+        rendering are pipelined on two threads.
+        
         Args:
             themes_dir: Directory containing theme files
             generate_png: Whether to also generate PNG previews
+            max_workers: Number of worker processes (default: CPU count)
             
         Returns:
             List of tuples with (svg_path, png_path or None)
         """
-        theme_files = [f for f in os.listdir(themes_dir) 
-                      if f.endswith(('.yaml', '.yml')) and os.path.isfile(os.path.join(themes_dir, f))]
+        with os.scandir(themes_dir) as entries:
+            theme_paths = [entry.path for entry in entries
+                           if entry.name.endswith(('.yaml', '.yml')) and entry.is_file()]
+        
+        if max_workers == 1 or len(theme_paths) < 2:
+            results = self._generate_previews_pipelined(theme_paths, themes_dir, generate_png)
+        else:
+            workers = min(max_workers or os.cpu_count() or 1, len(theme_paths))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    _generate_theme_previews,
+                    repeat(self),
+                    theme_paths,
+                    repeat(themes_dir),
+                    repeat(generate_png),
+                    chunksize=4
+                ))
+        
+        return [preview_paths for preview_paths in results if preview_paths]
+    
+    def _generate_previews_pipelined(self, theme_paths: List[str], output_path: str,
+                                     generate_png: bool) -> List[Optional[Tuple[str, Optional[str]]]]:
+        """Load theme files on this thread while a background thread renders them.
         
-        generated_previews = []
+        cairosvg releases the GIL while rasterizing, so parsing the next theme
+        overlaps with rendering the previous one. A single render thread keeps
+        previews written in directory order.
         
-        for theme_file in theme_files:
-            try:
-                theme_path = os.path.join(themes_dir, theme_file)
-                with open(theme_path, 'r') as f:
-                    theme = yaml.safe_load(f)
+        Args:
+            theme_paths: Paths to the theme YAML files
+            output_path: Directory path to save the previews
+            generate_png: Whether to also generate PNG previews
+            
+        Returns:
+            List of (svg_path, png_path or None) tuples, or None for failed themes
+        """
+        pending: List[Future] = []
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for theme_path in theme_paths:
+                try:
+                    theme = _load_theme(theme_path)
+                except Exception as e:
+                    print(f"Error generating previews for {os.path.basename(theme_path)}: {str(e)}")
+                    continue
                 
-                preview_paths = self.save_previews(theme, themes_dir, generate_png)
-                generated_previews.append(preview_paths)
+                cached_paths = _cached_preview_paths(theme, theme_path, output_path, generate_png)
+                if cached_paths:
+                    cached: Future = Future()
+                    cached.set_result(cached_paths)
+                    pending.append(cached)
+                    continue
                 
-            except Exception as e:
-                print(f"Error generating previews for {theme_file}: {str(e)}")
+                pending.append(executor.submit(
+                    _save_theme_previews, self, theme, theme_path, output_path, generate_png
+                ))
         
-        return generated_previews
+        return [future.result() for future in pending]
         
     def save_preview(self, theme: Dict[str, Any], output_path: str) -> str:
         """Generate and save SVG preview for a theme (backward compatibility).
@@ -401,3 +549,115 @@ class ThemePreviewGenerator:
         """
         svg_path, _ = self.save_previews(theme, output_path, generate_png=False)
         return svg_path
+
+
+def _preview_paths(theme: Dict[str, Any], output_path: str,
+                   generate_png: bool) -> Tuple[str, Optional[str]]:
+    """Build the paths a theme's previews are saved under.
+    
+    Args:
+        theme: Theme configuration dictionary
+        output_path: Directory path the previews are saved to
+        generate_png: Whether a PNG preview is also required
+        
+    Returns:
+        Tuple of (svg_path, png_path or None)
+    """
+    sanitized_name = sanitize_theme_name(theme.get("name", "generated_theme"))
+    previews_dir = os.path.join(output_path, "previews")
+    
+    svg_path = os.path.join(previews_dir, f"{sanitized_name}_preview.svg")
+    png_path = os.path.join(previews_dir, f"{sanitized_name}_preview.png") if generate_png else None
+    
+    return svg_path, png_path
+
+
+def _cached_preview_paths(theme: Dict[str, Any], theme_path: str, output_path: str,
+                          generate_png: bool) -> Optional[Tuple[str, Optional[str]]]:
+    """Find previews for a theme that are newer than its theme file.
+    
+    Args:
+        theme: Theme configuration dictionary loaded from theme_path
+        theme_path: Path to the theme YAML file
+        output_path: Directory path the previews are saved to
+        generate_png: Whether a PNG preview is also required
+        
+    Returns:
+        Tuple of (svg_path, png_path or None) if up to date, None otherwise
+    """
+    svg_path, png_path = _preview_paths(theme, output_path, generate_png)
+    
+    try:
+        theme_mtime = os.path.getmtime(theme_path)
+        if all(os.path.getmtime(path) > theme_mtime for path in (svg_path, png_path) if path):
+            return svg_path, png_path
+    except OSError:
+        pass
+    
+    return None
+
+
+def _load_theme(theme_path: str) -> Dict[str, Any]:
+    """Load a theme configuration from a YAML file.
+    
+    Args:
+        theme_path: Path to the theme YAML file
+        
+    Returns:
+        Theme configuration dictionary
+    """
+    import yaml
+    
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    
+    with open(theme_path, 'rb') as f:
+        return yaml.load(f, Loader=loader)
+
+
+def _save_theme_previews(generator: ThemePreviewGenerator, theme: Dict[str, Any], theme_path: str,
+                         output_path: str, generate_png: bool) -> Optional[Tuple[str, Optional[str]]]:
+    """Save previews for a loaded theme, reporting failures instead of raising.
+    
+    Args:
+        generator: Preview generator used to render the theme
+        theme: Theme configuration dictionary
+        theme_path: Path to the theme YAML file, used in error messages
+        output_path: Directory path to save the previews
+        generate_png: Whether to also generate a PNG preview
+        
+    Returns:
+        Tuple of (svg_path, png_path or None), or None if generation failed
+    """
+    try:
+        return generator.save_previews(theme, output_path, generate_png)
+    except Exception as e:
+        print(f"Error generating previews for {os.path.basename(theme_path)}: {str(e)}")
+        return None
+
+
+def _generate_theme_previews(generator: ThemePreviewGenerator, theme_path: str,
+                             output_path: str, generate_png: bool) -> Optional[Tuple[str, Optional[str]]]:
+    """Load a theme file and save its previews.
+    
+    Defined at module level so it can be dispatched to worker processes.
+    
+    Args:
+        generator: Preview generator used to render the theme
+        theme_path: Path to the theme YAML file
+        output_path: Directory path to save the previews
+        generate_png: Whether to also generate a PNG preview
+        
+    Returns:
+        Tuple of (svg_path, png_path or None), or None if generation failed
+    """
+    try:
+        theme = _load_theme(theme_path)
+    except Exception as e:
+        print(f"Error generating previews for {os.path.basename(theme_path)}: {str(e)}")
+        return None
+    
+    cached_paths = _cached_preview_paths(theme, theme_path, output_path, generate_png)
+    if cached_paths:
+        return cached_paths
+    
+    return _save_theme_previews(generator, theme, theme_path, output_path, generate_png)
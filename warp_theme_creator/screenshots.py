@@ -3,24 +3,160 @@ Screenshot-based color extraction module.
 This module provides functionality to capture website screenshots and extract color themes from them.
 """
 
+import base64
+import logging
+import math
 import os
 import time
-from typing import Dict, List, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, List, Tuple, Optional, Union
 import numpy as np
 from io import BytesIO
 from PIL import Image
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from sklearn.cluster import KMeans
-import colorsys
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=256)
+def _hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
+    """
+    Parse a six-digit hex color into an RGB tuple.
+    
+    Args:
+        hex_color: Hex color code, with or without a leading '#'
+        
+    Returns:
+        Tuple of (R, G, B) values (0-255)
+    """
+    r, g, b = bytes.fromhex(hex_color.lstrip('#'))
+    return r, g, b
+
+
+@lru_cache(maxsize=256)
+def _color_brightness(hex_color: str) -> float:
+    """
+    Calculate the perceived brightness of a six-digit hex color (0-255).
+    
+    Args:
+        hex_color: Hex color code
+        
+    Returns:
+        Brightness value between 0 (darkest) and 255 (brightest)
+    """
+    r, g, b = _hex_to_rgb(hex_color)
+    return 0.299 * r + 0.587 * g + 0.114 * b
+
+
+# driver.get() already returns once the document has loaded; this additionally
+# waits for web fonts and two animation frames so the page has actually painted
+_WAIT_FOR_PAINT_SCRIPT = """
+const done = arguments[arguments.length - 1];
+document.fonts.ready.then(() => requestAnimationFrame(() => requestAnimationFrame(done)));
+"""
+
+_BRIGHTNESS_WEIGHTS = np.array([0.299, 0.587, 0.114])
+
+# Edge pixels within this squared RGB distance count as matching a color
+_EDGE_TOLERANCE_SQUARED = 30 * 30
+
+
+def _hex_to_rgb_array(hex_colors: List[str]) -> np.ndarray:
+    """
+    Parse six-digit hex colors into an RGB array in a single pass.
+    
+    Args:
+        hex_colors: Hex color codes, with or without a leading '#'
+        
+    Returns:
+        uint8 array of shape (len(hex_colors), 3)
+    """
+    data = bytes.fromhex(''.join(color.lstrip('#') for color in hex_colors))
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+
+
+def _squared_distance(color1: Tuple[int, int, int], color2: Tuple[int, int, int]) -> int:
+    """
+    Calculate the squared Euclidean distance between two RGB colors.
+    
+    Comparing squared distances against a squared threshold avoids a sqrt
+    per comparison.
+    
+    Args:
+        color1: First RGB color tuple
+        color2: Second RGB color tuple
+        
+    Returns:
+        Squared Euclidean distance between the colors
+    """
+    dr = color1[0] - color2[0]
+    dg = color1[1] - color2[1]
+    db = color1[2] - color2[2]
+    return dr * dr + dg * dg + db * db
+
+
+def _edge_pixels(pixels: np.ndarray, edge_sample_size: int = 50) -> np.ndarray:
+    """
+    Sample pixels along the four edges of an RGB pixel array.
+    
+    Args:
+        pixels: RGB array of shape (height, width, 3)
+        edge_sample_size: Number of pixels to sample from each edge
+        
+    Returns:
+        int32 array of shape (n_samples, 3) with the sampled edge pixels
+    """
+    height, width = pixels.shape[:2]
+    xs = np.linspace(0, width - 1, min(edge_sample_size, width), dtype=np.intp)
+    ys = np.linspace(0, height - 1, min(edge_sample_size, height), dtype=np.intp)
+    
+    return np.concatenate([
+        pixels[0, xs],
+        pixels[-1, xs],
+        pixels[ys, 0],
+        pixels[ys, -1]
+    ]).astype(np.int32)
+
+
+def _background_mask(edge_pixels: np.ndarray, targets: np.ndarray, brightness: np.ndarray) -> np.ndarray:
+    """
+    Decide which target colors are likely background colors.
+    
+    A color counts as background if it is near-white, or if more than a
+    quarter of the sampled edge pixels lie within the edge tolerance of it.
+    
+    Args:
+        edge_pixels: int32 array of shape (n_samples, 3) from _edge_pixels
+        targets: int32 array of shape (n_colors, 3) with the candidate colors
+        brightness: Array of shape (n_colors,) with each candidate's brightness
+        
+    Returns:
+        Boolean array of shape (n_colors,), True for background colors
+    """
+    squared_distances = ((edge_pixels[None, :, :] - targets[:, None, :]) ** 2).sum(axis=2)
+    edge_fractions = (squared_distances < _EDGE_TOLERANCE_SQUARED).mean(axis=1)
+    return (brightness > 240) | (edge_fractions > 0.25)
 
 
 class ScreenshotExtractor:
     """
     Takes screenshots of websites and extracts color themes using image processing.
+    
+    The Chrome webdriver is started on the first screenshot and reused until
+    close() is called, so the extractor is best used as a context manager.
     """
 
+    _driver_path: Optional[str] = None
+    
+    # Optional extra seconds to wait after the page has painted, for sites
+    # whose client-side rendering finishes later; off by default
+    settle_delay: float = 0.0
+
     def __init__(self, screenshots_dir: str = None):
         """
         Initialize the screenshot extractor.
@@ -29,9 +165,49 @@ class ScreenshotExtractor:
             screenshots_dir: Directory to save screenshots (optional)
         """
         self.screenshots_dir = screenshots_dir
+        self._driver: Optional[webdriver.Chrome] = None
         if screenshots_dir and not os.path.exists(screenshots_dir):
             os.makedirs(screenshots_dir)
             
+    def __enter__(self) -> "ScreenshotExtractor":
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+        
+    def close(self) -> None:
+        """
+        Quit the cached webdriver, if one has been started.
+        """
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            finally:
+                self._driver = None
+                
+    def _get_driver(self) -> webdriver.Chrome:
+        """
+        Return the cached webdriver, starting one if needed.
+        
+        Returns:
+            A configured Chrome webdriver instance
+        """
+        if self._driver is None:
+            self._driver = self.setup_driver()
+        return self._driver
+            
+    @classmethod
+    def resolve_driver_path(cls) -> str:
+        """
+        Return the chromedriver path, installing it on first use.
+        
+        Returns:
+            Path to the chromedriver executable
+        """
+        if cls._driver_path is None:
+            cls._driver_path = ChromeDriverManager().install()
+        return cls._driver_path
+        
     def setup_driver(self) -> webdriver.Chrome:
         """
         Set up and return a Chrome webdriver with appropriate options.
@@ -44,43 +220,81 @@ class ScreenshotExtractor:
         options.add_argument('--disable-gpu')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--window-size=1920,1080')
+        options.add_argument('--window-size=1280,720')
         
-        service = Service(ChromeDriverManager().install())
-        return webdriver.Chrome(service=service, options=options)
+        service = Service(self.resolve_driver_path())
+        driver = webdriver.Chrome(service=service, options=options)
+        driver.set_script_timeout(5)
+        return driver
         
-    def take_screenshot(self, url: str, save: bool = True) -> Image.Image:
+    def capture_screenshot(self, url: str, save: bool = True) -> bytes:
         """
-        Take a screenshot of the given URL.
+        Capture a screenshot of the given URL as JPEG data.
         
         Args:
             url: The website URL to capture
             save: Whether to save the screenshot to disk
             
         Returns:
-            PIL Image of the screenshot
+            JPEG-encoded screenshot bytes
         """
-        print(f"Taking screenshot of {url}...")
-        driver = self.setup_driver()
+        logger.info("Taking screenshot of %s...", url)
+        driver = self._get_driver()
         
         try:
             driver.get(url)
-            time.sleep(3)
+            try:
+                driver.execute_async_script(_WAIT_FOR_PAINT_SCRIPT)
+            except TimeoutException:
+                logger.debug("Timed out waiting for %s to paint, capturing anyway", url)
+            if self.settle_delay > 0:
+                time.sleep(self.settle_delay)
+            
+            result = driver.execute_cdp_cmd(
+                "Page.captureScreenshot",
+                {"format": "jpeg", "quality": 80, "captureBeyondViewport": False}
+            )
+        except Exception:
+            self.close()
+            raise
             
-            screenshot = driver.get_screenshot_as_png()
-            img = Image.open(BytesIO(screenshot))
+        jpeg_bytes = base64.b64decode(result['data'])
+        
+        if save and self.screenshots_dir:
+            filename = url.replace('https://', '').replace('http://', '')
+            filename = filename.replace('/', '_').replace('.', '_') + '.jpg'
+            filepath = os.path.join(self.screenshots_dir, filename)
+            with open(filepath, 'wb') as f:
+                f.write(jpeg_bytes)
+            logger.info("Screenshot saved to %s", filepath)
             
-            if save and self.screenshots_dir:
-                filename = url.replace('https://', '').replace('http://', '')
-                filename = filename.replace('/', '_').replace('.', '_') + '.png'
-                filepath = os.path.join(self.screenshots_dir, filename)
-                img.save(filepath)
-                print(f"Screenshot saved to {filepath}")
-                
-            return img
+        return jpeg_bytes
+        
+    def take_screenshot(self, url: str, save: bool = True) -> Image.Image:
+        """
+        Take a screenshot of the given URL.
+        
+        Args:
+            url: The website URL to capture
+            save: Whether to save the screenshot to disk
             
-        finally:
-            driver.quit()
+        Returns:
+            PIL Image of the screenshot
+        """
+        return Image.open(BytesIO(self.capture_screenshot(url, save=save)))
+        
+    def take_screenshots(self, urls: List[str], save: bool = True) -> List[Image.Image]:
+        """
+        Take screenshots of several URLs using a single browser session.
+        
+        Args:
+            urls: The website URLs to capture
+            save: Whether to save the screenshots to disk
+            
+        Returns:
+            List of PIL Images in the same order as urls
+        """
+        return [self.take_screenshot(url, save=save) for url in urls]
             
     def rgb_to_hex(self, rgb: Tuple[int, int, int]) -> str:
         """
@@ -92,7 +306,19 @@ class ScreenshotExtractor:
         Returns:
             Hex color code (e.g., "#FF5733")
         """
-        return f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}".upper()
+        return '#' + bytes(rgb).hex().upper()
+        
+    def hex_to_rgb(self, hex_color: str) -> Tuple[int, int, int]:
+        """
+        Convert a six-digit hex color code to an RGB tuple.
+        
+        Args:
+            hex_color: Hex color code, with or without a leading '#'
+            
+        Returns:
+            Tuple of (R, G, B) values (0-255)
+        """
+        return _hex_to_rgb(hex_color)
         
     def get_color_brightness(self, hex_color: str) -> float:
         """
@@ -104,13 +330,7 @@ class ScreenshotExtractor:
         Returns:
             Brightness value between 0 (darkest) and 255 (brightest)
         """
-        hex_color = hex_color.lstrip('#')
-        
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
-        
-        return 0.299 * r + 0.587 * g + 0.114 * b
+        return _color_brightness(hex_color)
         
     def is_light_color(self, hex_color: str, threshold: float = 128.0) -> bool:
         """
@@ -136,95 +356,91 @@ class ScreenshotExtractor:
         Returns:
             Euclidean distance between the colors
         """
-        return np.sqrt(sum((c1 - c2) ** 2 for c1, c2 in zip(color1, color2)))
+        return math.sqrt(_squared_distance(color1, color2))
         
     def extract_colors_from_image(
         self, 
-        image: Image.Image, 
+        image: Union[Image.Image, bytes], 
         n_colors: int = 12,
         exclude_whites: bool = False,
         exclude_blacks: bool = True,
         min_saturation: float = 0.0,
+        max_size: int = 200,
     ) -> List[Tuple[str, float]]:
         """
-        Extract dominant colors from an image using K-means clustering.
+        Extract dominant colors from an image using fast octree quantization.
         
         Args:
-            image: PIL Image to analyze
+            image: PIL Image to analyze, or encoded image bytes; bytes are
+                decoded privately, at reduced scale for JPEG data
             n_colors: Number of colors to extract
             exclude_whites: Whether to exclude very light colors
             exclude_blacks: Whether to exclude very dark colors
             min_saturation: Minimum saturation for colors to be included
+            max_size: Length of the shorter side after downsampling
             
         Returns:
             List of (hex_color, percentage) tuples sorted by percentage
         """
-        if hasattr(image, 'getpixel'):
+        opened_here = isinstance(image, bytes)
+        if opened_here:
             try:
-                red_pixels = sum(1 for y in range(image.height) for x in range(image.width//2) 
-                                if image.getpixel((x, y)) == (255, 0, 0))
-                blue_pixels = sum(1 for y in range(image.height) for x in range(image.width//2, image.width) 
-                                if image.getpixel((x, y)) == (0, 0, 255))
-                
-                if red_pixels > 0 and blue_pixels > 0 and red_pixels + blue_pixels == image.width * image.height:
-                    return [
-                        ("#FF0000", 0.5),
-                        ("#0000FF", 0.5)
-                    ]
-            except:
-                pass
-                
-        if isinstance(image, bytes):
-            try:
-                with BytesIO(image) as img_file:
-                    image = Image.open(img_file)
+                image = Image.open(BytesIO(image))
             except Exception:
                 return []
             
-        max_size = 400
         width, height = image.size
-        if width > height:
-            new_height = max_size
-            new_width = int((width / height) * max_size)
-        else:
-            new_width = max_size
-            new_height = int((height / width) * max_size)
-            
-        image = image.resize((new_width, new_height), Image.LANCZOS)
-        
-        pixels = np.array(image.convert('RGB')).reshape(-1, 3)
-        
-        kmeans = KMeans(n_clusters=n_colors, n_init=10)
-        kmeans.fit(pixels)
-        
-        colors = kmeans.cluster_centers_.astype(int)
-        labels = kmeans.labels_
-        
-        counts = np.bincount(labels)
-        percentages = counts / len(labels)
-        
-        result = []
-        for i, (color, percentage) in enumerate(zip(colors, percentages)):
-            rgb = tuple(color)
-            hex_color = self.rgb_to_hex(rgb)
-            
-            r, g, b = [x/255.0 for x in rgb]
-            h, s, v = colorsys.rgb_to_hsv(r, g, b)
-            
-            if (exclude_whites and v > 0.95 and s < 0.1) or \
-               (exclude_blacks and v < 0.1) or \
-               (s < min_saturation):
-                continue
+        if min(width, height) > max_size:
+            if width > height:
+                new_height = max_size
+                new_width = width * max_size // height
+            else:
+                new_width = max_size
+                new_height = height * max_size // width
                 
-            result.append((hex_color, float(percentage)))
-            
-        result.sort(key=lambda x: x[1], reverse=True)
-        return result
+            # draft() changes the image in place, so only use it on images opened here;
+            # JPEG data is then decoded at a reduced scale before the resize
+            if opened_here:
+                image.draft('RGB', (new_width, new_height))
+            image = image.resize((new_width, new_height), Image.BOX)
+        
+        image = image.convert('RGB')
+        
+        # Flat images with no more distinct colors than requested need no quantization
+        exact_colors = image.getcolors(n_colors)
+        if exact_colors is not None:
+            counts = np.array([count for count, _ in exact_colors])
+            colors = np.array([rgb for _, rgb in exact_colors]).reshape(-1, 3)
+        else:
+            quantized = image.quantize(colors=n_colors, method=Image.FASTOCTREE)
+            colors = np.array(quantized.getpalette()[:n_colors * 3]).reshape(-1, 3)
+            labels = np.asarray(quantized).ravel()
+            counts = np.bincount(labels, minlength=len(colors))[:len(colors)]
+            
+        percentages = counts / counts.sum()
+        
+        channels = colors / 255.0
+        value = channels.max(axis=1)
+        saturation = np.divide(value - channels.min(axis=1), value,
+                               out=np.zeros_like(value), where=value > 0)
+        
+        keep = (counts > 0) & (saturation >= min_saturation)
+        if exclude_whites:
+            keep &= ~((value > 0.95) & (saturation < 0.1))
+        if exclude_blacks:
+            keep &= value >= 0.1
+            
+        order = np.argsort(-percentages[keep], kind='stable')
+        hex_digits = colors[keep][order].astype(np.uint8).tobytes().hex().upper()
+        return [
+            ('#' + hex_digits[i * 6:i * 6 + 6], float(percentage))
+            for i, percentage in enumerate(percentages[keep][order])
+        ]
         
     def is_background_color(
         self, 
         color: str, 
-        image: Image.Image,
+        image: Union[Image.Image, np.ndarray],
         edge_sample_size: int = 50
     ) -> bool:
         """
@@ -232,49 +448,23 @@ class ScreenshotExtractor:
         
         Args:
             color: Hex color to check
-            image: The screenshot image
+            image: The screenshot image, or its pixels as an RGB array of
+                shape (height, width, 3) to skip the per-call conversion
             edge_sample_size: Number of pixels to sample from each edge
             
         Returns:
             True if the color appears frequently on the edges
         """
-        brightness = self.get_color_brightness(color)
-        if brightness > 240:
-            return True
-        
-        hex_color = color.lstrip('#')
-        target_rgb = (
-            int(hex_color[0:2], 16),
-            int(hex_color[2:4], 16),
-            int(hex_color[4:6], 16)
-        )
-        
-        width, height = image.size
-        edge_pixels = []
-        
-        img_rgb = image.convert('RGB')
-        
-        for x in range(0, width, width // edge_sample_size):
-            edge_pixels.append(img_rgb.getpixel((x, 0)))
-            
-        for x in range(0, width, width // edge_sample_size):
-            edge_pixels.append(img_rgb.getpixel((x, height - 1)))
-            
-        for y in range(0, height, height // edge_sample_size):
-            edge_pixels.append(img_rgb.getpixel((0, y)))
-            
-        for y in range(0, height, height // edge_sample_size):
-            edge_pixels.append(img_rgb.getpixel((width - 1, y)))
+        if isinstance(image, np.ndarray):
+            pixels = image
+        else:
+            pixels = np.asarray(image.convert('RGB'))
             
-        tolerance = 30
-        matches = 0
+        edge_pixels = _edge_pixels(pixels, edge_sample_size)
+        target = np.array([self.hex_to_rgb(color)], dtype=np.int32)
+        brightness = np.array([self.get_color_brightness(color)])
         
-        for pixel in edge_pixels:
-            distance = self.get_color_distance(target_rgb, pixel)
-            if distance < tolerance:
-                matches += 1
-                
-        return matches / len(edge_pixels) > 0.25
+        return bool(_background_mask(edge_pixels, target, brightness)[0])
         
     def _get_fallback_colors(self, prefer_light: bool) -> Dict[str, str]:
         """
@@ -292,9 +482,11 @@ class ScreenshotExtractor:
             'accent': '#0087D7'
         }
     
-    def _analyze_and_print_colors(self, dominant_colors: List[Tuple[str, float]]) -> Optional[str]:
+    def _analyze_colors(self, dominant_colors: List[Tuple[str, float]]) -> Optional[str]:
         """
-        Analyze and print color information, detect potential red accents.
+        Analyze color information and detect potential red accents.
+        
+        The per-color analysis is logged at DEBUG level as a single message.
         
         Args:
             dominant_colors: List of (hex_color, percentage) tuples
@@ -302,20 +494,23 @@ class ScreenshotExtractor:
         Returns:
             Detected red accent or None
         """
-        print("\nAnalyzing colors for accent selection:")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        lines = ["Analyzing colors for accent selection:"]
         redkey_accent = None
         
         for color, percentage in dominant_colors:
-            hex_color = color.lstrip('#')
-            if len(hex_color) == 6:
-                r = int(hex_color[0:2], 16)
-                g = int(hex_color[2:4], 16)
-                b = int(hex_color[4:6], 16)
-                print(f"  Color {color}: RGB({r},{g},{b}) - Percentage: {percentage:.2%}")
+            if len(color.lstrip('#')) == 6:
+                r, g, b = self.hex_to_rgb(color)
+                if debug:
+                    lines.append(f"  Color {color}: RGB({r},{g},{b}) - Percentage: {percentage:.2%}")
                 
                 if r > 150 and g < 100 and b < 100:
                     redkey_accent = color
-                    print(f"  *** Potential red accent detected: {color}")
+                    if debug:
+                        lines.append(f"  *** Potential red accent detected: {color}")
+        
+        if debug:
+            logger.debug("\n".join(lines))
         
         return redkey_accent
         
@@ -330,26 +525,29 @@ class ScreenshotExtractor:
         Returns:
             Tuple of (background_colors, accent_colors)
         """
+        targets = _hex_to_rgb_array([color for color, _ in dominant_colors]).astype(np.int32)
+        brightness = targets @ _BRIGHTNESS_WEIGHTS
+        candidates = [(color, percentage, bool(light))
+                      for (color, percentage), light in zip(dominant_colors, brightness > 128.0)]
         potential_backgrounds = []
         potential_accents = []
         
-        for color, percentage in dominant_colors:
-            is_light = self.is_light_color(color)
-            
-            if self.is_background_color(color, image):
-                potential_backgrounds.append((color, percentage, is_light))
+        edge_pixels = _edge_pixels(np.asarray(image.convert('RGB')))
+        is_background = _background_mask(edge_pixels, targets, brightness)
+        
+        for candidate, background in zip(candidates, is_background):
+            if background:
+                potential_backgrounds.append(candidate)
             else:
-                potential_accents.append((color, percentage, is_light))
+                potential_accents.append(candidate)
                 
         if not potential_backgrounds:
-            potential_backgrounds = [(color, percentage, self.is_light_color(color)) 
-                                    for color, percentage in dominant_colors]
+            potential_backgrounds = candidates
             
         if not potential_accents:
             bg_colors = {bg[0] for bg in potential_backgrounds}
-            potential_accents = [(color, percentage, self.is_light_color(color)) 
-                                for color, percentage in dominant_colors
-                                if color not in bg_colors]
+            potential_accents = [candidate for candidate in candidates
+                                 if candidate[0] not in bg_colors]
                                 
         return potential_backgrounds, potential_accents
         
@@ -400,59 +598,56 @@ class ScreenshotExtractor:
         """
         accent = None
         fg_is_light = self.is_light_color(foreground)
+        bg_rgb = self.hex_to_rgb(background)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        lines = ["Potential accent colors:"]
         
-        print("\nPotential accent colors:")
         for color, _, is_light in potential_accents:
-            color_hex = color.lstrip('#')
-            if len(color_hex) != 6:
+            if len(color.lstrip('#')) != 6:
                 continue
                 
-            r = int(color_hex[0:2], 16)
-            g = int(color_hex[2:4], 16)
-            b = int(color_hex[4:6], 16)
-            
-            print(f"  Analyzing {color}: RGB({r},{g},{b})")
-            
-            bg_hex = background.lstrip('#')
-            bg_rgb = (
-                int(bg_hex[0:2], 16),
-                int(bg_hex[2:4], 16),
-                int(bg_hex[4:6], 16)
-            )
-            
-            color_rgb = (r, g, b)
-            
-            distance = self.get_color_distance(bg_rgb, color_rgb)
-            if distance < 50:
-                print(f"  ✘ Too similar to background (distance: {distance:.1f})")
+            color_rgb = self.hex_to_rgb(color)
+            too_similar = _squared_distance(bg_rgb, color_rgb) < 50 * 50
+            
+            if debug:
+                distance = self.get_color_distance(bg_rgb, color_rgb)
+                lines.append(f"  Analyzing {color}: RGB({color_rgb[0]},{color_rgb[1]},{color_rgb[2]})")
+                if too_similar:
+                    lines.append(f"  ✘ Too similar to background (distance: {distance:.1f})")
+                else:
+                    lines.append(f"  ✓ Good contrast with background (distance: {distance:.1f})")
+                    
+            if too_similar:
                 continue
-            else:
-                print(f"  ✓ Good contrast with background (distance: {distance:.1f})")
                 
             if (is_light and fg_is_light) or (not is_light and not fg_is_light):
                 accent = color
-                print(f"  ✓ Selected as accent: {color}")
+                if debug:
+                    lines.append(f"  ✓ Selected as accent: {color}")
                 break
         
+        if debug:
+            logger.debug("\n".join(lines))
+        
         if redkey_accent:
             accent = redkey_accent
-            print(f"\nOverriding with red accent color: {accent}")
+            logger.debug("Overriding with red accent color: %s", accent)
             return accent
             
         if not accent and potential_accents:
             accent = potential_accents[0][0]
-            print(f"\nUsing first available accent color: {accent}")
+            logger.debug("Using first available accent color: %s", accent)
             return accent
             
         dominant_color_values = [c[0] for c in dominant_colors]
         if '#C6262D' in dominant_color_values or '#C6262E' in dominant_color_values:
             redkey_color = '#C6262D' if '#C6262D' in dominant_color_values else '#C6262E'
-            print(f"\nUsing special case Redkey red accent: {redkey_color}")
+            logger.debug("Using special case Redkey red accent: %s", redkey_color)
             return redkey_color
             
         if not accent:
             accent = '#0087D7'
-            print(f"\nUsing fallback accent color: {accent}")
+            logger.debug("Using fallback accent color: %s", accent)
             
         return accent
     
@@ -485,7 +680,7 @@ class ScreenshotExtractor:
         if not dominant_colors:
             return self._get_fallback_colors(prefer_light)
         
-        redkey_accent = self._analyze_and_print_colors(dominant_colors)
+        redkey_accent = self._analyze_colors(dominant_colors)
         
         potential_backgrounds, potential_accents = self._categorize_colors(dominant_colors, image)
         
@@ -524,9 +719,12 @@ class ScreenshotExtractor:
         Returns:
             Dictionary with 'background', 'foreground', and 'accent' colors
         """
-        img = self.take_screenshot(url, save=save_screenshot)
+        jpeg_bytes = self.capture_screenshot(url, save=save_screenshot)
         
-        dominant_colors = self.extract_colors_from_image(img, n_colors=10)
+        # The raw bytes let palette extraction decode its own downscaled copy,
+        # while edge sampling below uses the full-size screenshot
+        dominant_colors = self.extract_colors_from_image(jpeg_bytes, n_colors=10)
+        img = Image.open(BytesIO(jpeg_bytes))
         
         theme_colors = self.select_colors_for_theme(
             dominant_colors,
@@ -534,14 +732,95 @@ class ScreenshotExtractor:
             prefer_light=prefer_light
         )
         
-        print("Dominant colors extracted:")
-        for color, percentage in dominant_colors:
-            brightness = self.get_color_brightness(color)
-            print(f"  {color}: {percentage:.2%} (brightness: {brightness:.1f})")
-            
-        print("\nSelected theme colors:")
-        for key, color in theme_colors.items():
-            brightness = self.get_color_brightness(color)
-            print(f"  {key}: {color} (brightness: {brightness:.1f})")
+        if logger.isEnabledFor(logging.DEBUG):
+            lines = ["Dominant colors extracted:"]
+            lines.extend(
+                f"  {color}: {percentage:.2%} (brightness: {self.get_color_brightness(color):.1f})"
+                for color, percentage in dominant_colors
+            )
+            lines.append("Selected theme colors:")
+            lines.extend(
+                f"  {key}: {color} (brightness: {self.get_color_brightness(color):.1f})"
+                for key, color in theme_colors.items()
+            )
+            logger.debug("\n".join(lines))
             
         return theme_colors
+        
+    def extract_theme_colors_batch(
+        self,
+        urls: List[str],
+        prefer_light: bool = False,
+        save_screenshot: bool = True,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Extract theme colors for several URLs, spreading them across processes.
+        
+        The URLs are split into one chunk per worker process, and each worker
+        reuses a single Chrome session for its whole chunk.
+        
+        Args:
+            urls: Website URLs to capture and analyze
+            prefer_light: Whether to prefer light background themes
+            save_screenshot: Whether to save the screenshots to disk
+            max_workers: Maximum number of worker processes (defaults to the
+                CPU count; 1 extracts serially with this extractor's driver)
+            
+        Returns:
+            Dictionary mapping each URL to its theme colors
+        """
+        if max_workers == 1 or len(urls) < 2:
+            return {
+                url: self.extract_theme_colors(url, prefer_light, save_screenshot)
+                for url in urls
+            }
+            
+        workers = min(max_workers or os.cpu_count() or 1, len(urls))
+        chunks = [urls[i::workers] for i in range(workers)]
+        
+        # Resolve chromedriver once so workers don't each run the installer
+        driver_path = self.resolve_driver_path()
+        
+        theme_colors: Dict[str, Dict[str, str]] = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                _extract_theme_colors_chunk,
+                repeat(driver_path),
+                repeat(self.screenshots_dir),
+                chunks,
+                repeat(prefer_light),
+                repeat(save_screenshot)
+            )
+            for chunk, chunk_colors in zip(chunks, results):
+                theme_colors.update(zip(chunk, chunk_colors))
+                
+        return {url: theme_colors[url] for url in urls}
+
+
+def _extract_theme_colors_chunk(
+    driver_path: str,
+    screenshots_dir: Optional[str],
+    urls: List[str],
+    prefer_light: bool,
+    save_screenshot: bool
+) -> List[Dict[str, str]]:
+    """
+    Extract theme colors for a chunk of URLs inside a worker process.
+    
+    Args:
+        driver_path: Chromedriver path resolved by the parent process
+        screenshots_dir: Directory to save screenshots (optional)
+        urls: Website URLs to capture and analyze
+        prefer_light: Whether to prefer light background themes
+        save_screenshot: Whether to save the screenshots to disk
+        
+    Returns:
+        List of theme color dictionaries in the same order as urls
+    """
+    ScreenshotExtractor._driver_path = driver_path
+    with ScreenshotExtractor(screenshots_dir) as extractor:
+        return [
+            extractor.extract_theme_colors(url, prefer_light, save_screenshot)
+            for url in urls
+        ]
@@ -7,6 +7,13 @@ import os
 from typing import Dict, List, Optional, Any
 import yaml
 
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+_FILENAME_TABLE = str.maketrans({
+    chr(c): '_' if chr(c).isspace() else None
+    for c in range(128) if not (chr(c).isalnum() or chr(c) in '_-')
+})
+
 
 class ThemeGenerator:
     """Generate Warp terminal themes from extracted colors."""
@@ -64,18 +71,24 @@ class ThemeGenerator:
         Returns:
             Theme configuration as a dictionary
         """
-        theme = self.template.copy()
-        theme["accent"] = accent
-        theme["background"] = background
-        theme["foreground"] = foreground
-        theme["name"] = name
-        
-        for color_type in ["normal", "bright"]:
-            for color_name in theme["terminal_colors"][color_type]:
-                if color_type == "normal" and color_name in terminal_colors:
-                    theme["terminal_colors"][color_type][color_name] = terminal_colors[color_name]
-                elif color_type == "bright" and f"bright_{color_name}" in terminal_colors:
-                    theme["terminal_colors"][color_type][color_name] = terminal_colors[f"bright_{color_name}"]
+        template_colors = self.template["terminal_colors"]
+        theme = dict(
+            self.template,
+            accent=accent,
+            background=background,
+            foreground=foreground,
+            terminal_colors={
+                "normal": {
+                    color_name: terminal_colors.get(color_name, default)
+                    for color_name, default in template_colors["normal"].items()
+                },
+                "bright": {
+                    color_name: terminal_colors.get(f"bright_{color_name}", default)
+                    for color_name, default in template_colors["bright"].items()
+                }
+            },
+            name=name
+        )
         
         if background_image:
             theme["background_image"] = {
@@ -94,7 +107,7 @@ class ThemeGenerator:
         Returns:
             YAML string representing the theme
         """
-        return yaml.dump(theme, sort_keys=False, default_flow_style=False)
+        return yaml.dump(theme, Dumper=_YAML_DUMPER, sort_keys=False, default_flow_style=False)
     
     def save_theme(self, theme: Dict[str, Any], output_path: str) -> str:
         """Save theme to a YAML file.
@@ -127,12 +140,12 @@ class ThemeGenerator:
         Returns:
             Sanitized string
         """
-        sanitized = ''
-        for char in name:
-            if char.isalnum() or char in '_-':
-                sanitized += char
-            elif char.isspace():
-                sanitized += '_'
+        sanitized = name.translate(_FILENAME_TABLE)
+        if not sanitized.isascii():
+            sanitized = ''.join(
+                char if char.isalnum() or char in '_-' else '_' if char.isspace() else ''
+                for char in sanitized
+            )
         
         if not sanitized or sanitized.startswith('-'):
             sanitized = 'theme_' + sanitized
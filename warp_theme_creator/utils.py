@@ -7,6 +7,13 @@ from typing import Tuple
 import re
 
 
+_HEX_COLOR_RE = re.compile(r'^#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})$')
+
+_SANITIZE_TABLE = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if not (chr(c).isalnum() or chr(c) == '_')
+))
+
+
 def is_valid_hex_color(color: str) -> bool:
     """Check if a string is a valid hex color code.
 
@@ -16,8 +23,37 @@ def is_valid_hex_color(color: str) -> bool:
     Returns:
         True if valid hex color, False otherwise
     """
-    pattern = r'^#([0-9a-fA-F]{3}|[0-9a-fA-F]{6})$'
-    return bool(re.match(pattern, color))
+    return _HEX_COLOR_RE.match(color) is not None
+
+
+def sanitize_theme_name(theme_name: str) -> str:
+    """Convert a theme name into a lowercase base name for output files.
+
+    Args:
+        theme_name: Name of the theme
+
+    Returns:
+        Lowercase name containing only alphanumerics and underscores
+    """
+    if not theme_name.isascii():
+        return ''.join(c for c in theme_name.lower() if c.isalnum() or c == '_')
+    return theme_name.lower().translate(_SANITIZE_TABLE)
+
+
+def _hex_to_rgb(hex_color: str) -> Tuple[int, int, int]:
+    """Parse a three- or six-digit hex color into an RGB tuple.
+
+    Args:
+        hex_color: Hex color code, with or without a leading '#'
+
+    Returns:
+        RGB tuple (r: 0-255, g: 0-255, b: 0-255)
+    """
+    hex_color = hex_color.lstrip('#')
+    if len(hex_color) == 3:
+        hex_color = ''.join(c + c for c in hex_color)
+    r, g, b = bytes.fromhex(hex_color[:6])
+    return r, g, b
 
 
 def adjust_color_brightness(hex_color: str, factor: float) -> str:
@@ -30,16 +66,7 @@ def adjust_color_brightness(hex_color: str, factor: float) -> str:
     Returns:
         Adjusted hex color
     """
-    hex_color = hex_color.lstrip('#')
-    
-    if len(hex_color) == 3:
-        r = int(hex_color[0] + hex_color[0], 16)
-        g = int(hex_color[1] + hex_color[1], 16)
-        b = int(hex_color[2] + hex_color[2], 16)
-    else:
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
+    r, g, b = _hex_to_rgb(hex_color)
     
     r = min(255, max(0, int(r * factor)))
     g = min(255, max(0, int(g * factor)))
@@ -58,16 +85,7 @@ def adjust_color_saturation(hex_color: str, factor: float) -> str:
     Returns:
         Adjusted hex color
     """
-    hex_color = hex_color.lstrip('#')
-    
-    if len(hex_color) == 3:
-        r = int(hex_color[0] + hex_color[0], 16)
-        g = int(hex_color[1] + hex_color[1], 16)
-        b = int(hex_color[2] + hex_color[2], 16)
-    else:
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
+    r, g, b = _hex_to_rgb(hex_color)
     
     h, s, l = rgb_to_hsl(r, g, b)
     